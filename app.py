@@ -1,11 +1,30 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
+from sqlalchemy import and_, bindparam, case, delete, event, insert, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import aliased
+import json
 import os
+import re
+import string
+import threading
 from datetime import datetime
 import urllib.parse
+from collections import OrderedDict
 
 app = Flask(__name__)
+# Emit JSON keys in insertion order: sorting every object's keys on every
+# jsonify call is pure overhead for an API consumed by our own frontend
+app.json.sort_keys = False
+
+# Bare YouTube video ID: 11 characters of [A-Za-z0-9_-]
+YOUTUBE_VIDEO_ID_LENGTH = 11
+YOUTUBE_VIDEO_ID_CHARS = frozenset(string.ascii_letters + string.digits + '_-')
+# Video link embedded in a YouTube results page
+YOUTUBE_WATCH_LINK_RE = re.compile(r'/watch\?v=([a-zA-Z0-9_-]{11})')
+# Search results JSON embedded in a YouTube results page
+YOUTUBE_INITIAL_DATA_RE = re.compile(r'var ytInitialData = ({.*?});', re.DOTALL)
 
 # Check if we're in testing mode FIRST - before setting up database
 # This prevents tests from ever touching the production database
@@ -49,9 +68,38 @@ if not is_testing and db_url.startswith('sqlite:///') and ':memory:' not in db_u
 
 app.config['SQLALCHEMY_DATABASE_URI'] = db_url
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+# File-backed SQLite uses a QueuePool: keep a few warm connections so each one's
+# page cache and connect-time PRAGMAs survive across requests, and let a writer
+# wait up to 30s on another connection's lock instead of failing immediately.
+# (In-memory databases get a StaticPool from Flask-SQLAlchemy instead.)
+if db_url.startswith('sqlite') and ':memory:' not in db_url:
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': 5,
+        'max_overflow': 10,
+        'pool_recycle': -1,
+        'connect_args': {'check_same_thread': False, 'timeout': 30},
+    }
 db = SQLAlchemy(app)
 CORS(app)
 
+# SQLite tuning for file-backed databases: WAL lets reads proceed while a write
+# is in progress, and synchronous=NORMAL drops the extra fsync per commit that
+# WAL makes unnecessary (bulk imports and voting are commit-heavy). Temp tables
+# and sort spills stay in memory, and reads go through a 64 MB page cache
+# (negative cache_size is in KiB) backed by a 256 MB memory map.
+if db_url.startswith('sqlite') and ':memory:' not in db_url:
+    with app.app_context():
+        @event.listens_for(db.engine, 'connect')
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+            cursor.execute('PRAGMA temp_store=MEMORY')
+            cursor.execute('PRAGMA cache_size=-64000')
+            cursor.execute('PRAGMA mmap_size=268435456')
+            cursor.close()
+
 # Database Models
 class Collection(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -68,6 +116,9 @@ class Item(db.Model):
     media_link = db.Column(db.String(1000), nullable=True)  # YouTube or other media link
     points = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    
+    # points DESC, id matches get_collection's ORDER BY, so the ranking needs no sort step
+    __table_args__ = (db.Index('ix_item_collection_ranking', 'collection_id', points.desc(), 'id'),)
 
 class Comparison(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -77,23 +128,104 @@ class Comparison(db.Model):
     result = db.Column(db.String(20), nullable=True)  # 'item1', 'item2', or 'tie'
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     
-    __table_args__ = (db.UniqueConstraint('item1_id', 'item2_id', name='unique_comparison'),)
+    __table_args__ = (
+        db.UniqueConstraint('item1_id', 'item2_id', name='unique_comparison'),
+        db.Index('ix_comparison_collection_pair', 'collection_id', 'item1_id', 'item2_id'),
+        # item1_id lookups use unique_comparison; this serves "item1 OR item2" filters
+        db.Index('ix_comparison_item2', 'item2_id'),
+    )
+
+# Result to store when a comparison's items are swapped to put the smaller ID first
+SWAPPED_RESULT = {'item1': 'item2', 'item2': 'item1', 'tie': 'tie'}
+
+# Points awarded to (item1, item2) by a comparison result
+# Win: +1, loss: -1, tie or no result: 0
+RESULT_POINTS = {
+    None: (0, 0),
+    'tie': (0, 0),
+    'item1': (1, -1),
+    'item2': (-1, 1),
+}
+
+# Net (item1, item2) point change when a comparison's result changes from
+# old_result to new_result, for every combination: (old_result, new_result) -> deltas
+VOTE_POINT_DELTAS = {
+    (old_result, new_result): (new1 - old1, new2 - old2)
+    for old_result, (old1, old2) in RESULT_POINTS.items()
+    for new_result, (new1, new2) in RESULT_POINTS.items()
+}
+
+# Encoded GET /api/collections response body. Writes that change a collection's
+# name, search prefix or item count bump the generation; a body is only stored if
+# no write happened while it was being built, so a slow read can't cache stale data.
+_collections_list_cache = {'generation': 0, 'body': None}
+_collections_list_lock = threading.Lock()
+
+def invalidate_collections_list_cache():
+    """Drop the cached collections listing after a write."""
+    with _collections_list_lock:
+        _collections_list_cache['generation'] += 1
+        _collections_list_cache['body'] = None
+
+# Encoded GET /api/collections/<id> responses, least recently used first. Every
+# write to a collection's items, comparisons or details drops its entry; the
+# generation guards against storing a body built while a write was in progress.
+COLLECTION_VIEW_CACHE_SIZE = 128
+_collection_view_cache = OrderedDict()
+_collection_view_cache_state = {'generation': 0}
+_collection_view_lock = threading.Lock()
+
+def invalidate_collection_view_cache(collection_id):
+    """Drop the cached ranking view for a collection after a write."""
+    with _collection_view_lock:
+        _collection_view_cache_state['generation'] += 1
+        _collection_view_cache.pop(collection_id, None)
 
 # Routes
+# index.html is a static app shell with no template variables, so render it once
+# and serve the same bytes. Debug mode alone doesn't disable this (the server
+# always runs with debug=True); set TEMPLATES_AUTO_RELOAD to re-render on every
+# request while editing the template.
+_index_html = None
+
 @app.route('/')
 def index():
-    return render_template('index.html')
+    global _index_html
+    if _index_html is None or app.config.get('TEMPLATES_AUTO_RELOAD'):
+        _index_html = render_template('index.html').encode('utf-8')
+    return Response(_index_html, mimetype='text/html')
 
 @app.route('/api/collections', methods=['GET'])
 def get_collections():
-    collections = Collection.query.all()
-    return jsonify([{
-        'id': c.id,
-        'name': c.name,
-        'search_prefix': c.search_prefix,
-        'item_count': len(c.items),
-        'created_at': c.created_at.isoformat() if c.created_at else None
-    } for c in collections])
+    with _collections_list_lock:
+        generation = _collections_list_cache['generation']
+        body = _collections_list_cache['body']
+    if body is not None:
+        return Response(body, mimetype='application/json')
+    
+    # Count items in SQL with a single grouped query instead of lazy-loading
+    # every collection's items just to call len() on them
+    rows = db.session.query(
+        Collection.id,
+        Collection.name,
+        Collection.search_prefix,
+        Collection.created_at,
+        db.func.count(Item.id)
+    ).outerjoin(Item, Item.collection_id == Collection.id).group_by(Collection.id).all()
+
+    response = jsonify([{
+        'id': collection_id,
+        'name': name,
+        'search_prefix': search_prefix,
+        'item_count': item_count,
+        'created_at': created_at.isoformat() if created_at else None
+    } for collection_id, name, search_prefix, created_at, item_count in rows])
+    
+    with _collections_list_lock:
+        if _collections_list_cache['generation'] == generation:
+            _collections_list_cache['body'] = response.get_data()
+    
+    return response
 
 @app.route('/api/collections', methods=['POST'])
 def create_collection():
@@ -111,14 +243,34 @@ def create_collection():
     items_text = data.get('items', '').strip()
     items_list = [item.strip() for item in items_text.split('\n') if item.strip()]
     
-    for item_name in items_list:
-        item = Item(collection_id=collection.id, name=item_name)
-        db.session.add(item)
+    # Insert all items in one batched statement rather than one ORM object per row
+    if items_list:
+        db.session.execute(insert(Item), [
+            {'collection_id': collection.id, 'name': item_name}
+            for item_name in items_list
+        ])
     
     db.session.commit()
+    # SQLite can reuse the ID of a deleted collection, so never inherit a stale suggestion
+    invalidate_matchup_cache(collection.id)
+    invalidate_collection_view_cache(collection.id)
+    invalidate_collections_list_cache()
     return jsonify({'id': collection.id, 'name': collection.name, 'search_prefix': collection.search_prefix}), 201
 
-def calculate_sub_scores(items_in_group, comparisons):
+def index_comparisons_by_pair(comparisons):
+    """
+    Index comparison results by item pair for constant-time lookup.
+    
+    Args:
+        comparisons: List of Comparison objects
+    
+    Returns:
+        Dictionary mapping (item1_id, item2_id) to result, with the smaller ID first
+    """
+    # submit_matchup_result always stores the smaller ID as item1
+    return {(comp.item1_id, comp.item2_id): comp.result for comp in comparisons}
+
+def calculate_sub_scores(items_in_group, comparisons, comparisons_by_pair=None):
     """
     Calculate sub-scores for items within a tied group based on comparisons
     that involve ONLY items within that group.
@@ -126,6 +278,7 @@ def calculate_sub_scores(items_in_group, comparisons):
     Args:
         items_in_group: List of Item objects with the same main score
         comparisons: List of all Comparison objects for the collection
+        comparisons_by_pair: Optional index from index_comparisons_by_pair(comparisons)
     
     Returns:
         Dictionary mapping item_id to sub_score (int)
@@ -140,22 +293,37 @@ def calculate_sub_scores(items_in_group, comparisons):
     # Initialize sub-scores to 0
     sub_scores = {item.id: 0 for item in items_in_group}
     
+    group_size = len(group_item_ids)
+    if comparisons_by_pair is not None and group_size * (group_size - 1) // 2 < len(comparisons):
+        # Small group: look up each pair inside the group instead of scanning
+        # every comparison in the collection
+        from itertools import combinations
+        pair_results = (
+            (item1_id, item2_id, comparisons_by_pair.get((item1_id, item2_id)))
+            for item1_id, item2_id in combinations(sorted(group_item_ids), 2)
+        )
+    else:
+        pair_results = (
+            (comp.item1_id, comp.item2_id, comp.result)
+            for comp in comparisons
+            if comp.item1_id in group_item_ids and comp.item2_id in group_item_ids
+        )
+    
     # Process comparisons that involve ONLY items within this group
-    for comp in comparisons:
-        # Check if both items are in the group
-        if comp.item1_id in group_item_ids and comp.item2_id in group_item_ids:
-            # Calculate sub-score impact (same as main scoring: +1 win, -1 loss, 0 tie)
-            if comp.result == 'item1':
-                sub_scores[comp.item1_id] += 1
-                sub_scores[comp.item2_id] -= 1
-            elif comp.result == 'item2':
-                sub_scores[comp.item1_id] -= 1
-                sub_scores[comp.item2_id] += 1
-            # Ties don't affect sub-scores (already 0)
+    for item1_id, item2_id, result in pair_results:
+        # Calculate sub-score impact (same as main scoring: +1 win, -1 loss, 0 tie)
+        if result == 'item1':
+            sub_scores[item1_id] += 1
+            sub_scores[item2_id] -= 1
+        elif result == 'item2':
+            sub_scores[item1_id] -= 1
+            sub_scores[item2_id] += 1
+        # Ties don't affect sub-scores (already 0)
     
     return sub_scores
 
-def calculate_recursive_sub_scores(item, items_in_group, comparisons, current_level_score=None, max_depth=10):
+def calculate_recursive_sub_scores(item, items_in_group, comparisons, current_level_score=None, max_depth=10,
+                                   comparisons_by_pair=None):
     """
     Calculate recursive sub-scores for an item, returning a list of scores
     [main_score, sub_score_1, sub_score_2, ...] where each level represents
@@ -167,6 +335,7 @@ def calculate_recursive_sub_scores(item, items_in_group, comparisons, current_le
         comparisons: List of all Comparison objects
         current_level_score: The score at the current level (for recursion)
         max_depth: Maximum recursion depth to prevent infinite loops
+        comparisons_by_pair: Optional index from index_comparisons_by_pair(comparisons)
     
     Returns:
         List of scores [main_score, sub_score_1, sub_score_2, ...]
@@ -187,7 +356,7 @@ def calculate_recursive_sub_scores(item, items_in_group, comparisons, current_le
         level_score = current_level_score
     
     # Calculate sub-scores for items in this group
-    sub_scores = calculate_sub_scores(items_in_group, comparisons)
+    sub_scores = calculate_sub_scores(items_in_group, comparisons, comparisons_by_pair)
     current_sub_score = sub_scores.get(item.id, 0)
     
     # Check if there are multiple unique sub-scores (not all 0)
@@ -214,7 +383,8 @@ def calculate_recursive_sub_scores(item, items_in_group, comparisons, current_le
         # Recursively calculate sub-scores for the next level
         # Pass None for current_level_score since we're starting a new level
         next_level_scores = calculate_recursive_sub_scores(
-            item, items_with_same_sub_score, comparisons, None, max_depth - 1
+            item, items_with_same_sub_score, comparisons, None, max_depth - 1,
+            comparisons_by_pair
         )
         
         # Build the score path
@@ -237,51 +407,70 @@ def calculate_recursive_sub_scores(item, items_in_group, comparisons, current_le
         else:
             return [current_sub_score]
 
-def sort_items_with_tie_breaking(items, comparisons):
+def sort_items_with_tie_breaking(items, comparisons, comparisons_by_pair=None):
     """
     Sort items by points, using sub-scores to break ties.
     
     Args:
-        items: List of Item objects to sort
+        items: List of Item objects already ordered by points (descending) and
+               then ID, as returned by an ORDER BY points DESC, id query
         comparisons: List of Comparison objects for the collection
+        comparisons_by_pair: Optional index from index_comparisons_by_pair(comparisons)
     
     Returns:
         Sorted list of Item objects
     """
-    # First, sort by main points (descending)
-    items_by_points = {}
-    for item in items:
-        if item.points not in items_by_points:
-            items_by_points[item.points] = []
-        items_by_points[item.points].append(item)
+    from itertools import groupby
     
-    # Sort point groups in descending order
-    sorted_points = sorted(items_by_points.keys(), reverse=True)
+    if comparisons_by_pair is None:
+        comparisons_by_pair = index_comparisons_by_pair(comparisons)
     
-    # Build final sorted list
+    # Items arrive ordered by points, so each tied group is a consecutive run;
+    # only groups with more than one item need sub-scores
     sorted_items = []
-    for points in sorted_points:
-        group = items_by_points[points]
-        
-        if len(group) == 1:
-            # No tie-breaking needed
-            sorted_items.append(group[0])
-        else:
-            # Calculate sub-scores for this tied group
-            sub_scores = calculate_sub_scores(group, comparisons)
-            
-            # Sort within group by sub-score (descending), then by ID for stability
-            group.sort(key=lambda x: (sub_scores[x.id], -x.id), reverse=True)
-            sorted_items.extend(group)
+    for points, group in groupby(items, key=lambda item: item.points):
+        group = list(group)
+        if len(group) > 1:
+            sub_scores = calculate_sub_scores(group, comparisons, comparisons_by_pair)
+            # Sort by sub-score (descending); the sort is stable, so items with
+            # equal sub-scores keep their ascending-ID order from the query
+            group.sort(key=lambda x: sub_scores[x.id], reverse=True)
+        sorted_items.extend(group)
     
     return sorted_items
 
 @app.route('/api/collections/<int:collection_id>', methods=['GET'])
 def get_collection(collection_id):
+    with _collection_view_lock:
+        generation = _collection_view_cache_state['generation']
+        body = _collection_view_cache.get(collection_id)
+        if body is not None:
+            _collection_view_cache.move_to_end(collection_id)
+    if body is not None:
+        return Response(body, mimetype='application/json')
+    
     collection = Collection.query.get_or_404(collection_id)
-    # Use tie-breaking sorting algorithm
-    items = sort_items_with_tie_breaking(list(collection.items), list(collection.comparisons))
-    comparisons = list(collection.comparisons)
+    # Let SQL order items by points (served by ix_item_collection_ranking), then
+    # use tie-breaking sorting algorithm within each run of equal points
+    items = Item.query.filter_by(collection_id=collection_id).order_by(
+        Item.points.desc(), Item.id
+    ).all()
+    
+    # Comparisons are only needed to break ties between items with equal points;
+    # when every score is unique, just count them instead of loading every row
+    has_ties = any(a.points == b.points for a, b in zip(items, items[1:]))
+    if has_ties:
+        comparisons = Comparison.query.filter_by(collection_id=collection_id).all()
+        comparisons_count = len(comparisons)
+    else:
+        comparisons = []
+        comparisons_count = db.session.query(db.func.count(Comparison.id)).filter_by(
+            collection_id=collection_id
+        ).scalar()
+    
+    # Index comparisons once for every tie-breaking lookup in this view
+    comparisons_by_pair = index_comparisons_by_pair(comparisons)
+    items = sort_items_with_tie_breaking(items, comparisons, comparisons_by_pair)
     
     # Group items by score for recursive sub-score calculation
     items_by_score = {}
@@ -294,7 +483,9 @@ def get_collection(collection_id):
     items_data = []
     for item in items:
         items_with_same_score = items_by_score.get(item.points, [])
-        recursive_scores = calculate_recursive_sub_scores(item, items_with_same_score, comparisons)
+        recursive_scores = calculate_recursive_sub_scores(
+            item, items_with_same_score, comparisons, comparisons_by_pair=comparisons_by_pair
+        )
         
         item_data = {
             'id': item.id,
@@ -309,13 +500,21 @@ def get_collection(collection_id):
         
         items_data.append(item_data)
     
-    return jsonify({
+    response = jsonify({
         'id': collection.id,
         'name': collection.name,
         'search_prefix': collection.search_prefix,
         'items': items_data,
-        'comparisons_count': len(collection.comparisons)
+        'comparisons_count': comparisons_count
     })
+    
+    with _collection_view_lock:
+        if _collection_view_cache_state['generation'] == generation:
+            _collection_view_cache[collection_id] = response.get_data()
+            if len(_collection_view_cache) > COLLECTION_VIEW_CACHE_SIZE:
+                _collection_view_cache.popitem(last=False)
+    
+    return response
 
 @app.route('/api/collections/<int:collection_id>/score-distribution', methods=['GET'])
 def get_score_distribution(collection_id):
@@ -323,6 +522,8 @@ def get_score_distribution(collection_id):
     collection = Collection.query.get_or_404(collection_id)
     items = list(collection.items)
     comparisons = list(collection.comparisons)
+    # Index comparisons once for every sub-score lookup in this request
+    comparisons_by_pair = index_comparisons_by_pair(comparisons)
     
     # Group items by main score
     items_by_score = {}
@@ -340,7 +541,7 @@ def get_score_distribution(collection_id):
         items_in_group = items_by_score[score]
         
         # Calculate sub-scores for this group
-        sub_scores = calculate_sub_scores(items_in_group, comparisons)
+        sub_scores = calculate_sub_scores(items_in_group, comparisons, comparisons_by_pair)
         
         # Count sub-score distribution
         sub_score_counts = {}
@@ -379,6 +580,8 @@ def get_recursive_score_distribution(collection_id):
     collection = Collection.query.get_or_404(collection_id)
     items = list(collection.items)
     comparisons = list(collection.comparisons)
+    # Index comparisons once for every sub-score lookup in this request
+    comparisons_by_pair = index_comparisons_by_pair(comparisons)
     
     # Get score_path from query parameter
     score_path_json = request.args.get('score_path', '[]')
@@ -404,7 +607,7 @@ def get_recursive_score_distribution(collection_id):
         
         for score in sorted(items_by_score.keys(), reverse=True):
             items_in_group = items_by_score[score]
-            sub_scores = calculate_sub_scores(items_in_group, comparisons)
+            sub_scores = calculate_sub_scores(items_in_group, comparisons, comparisons_by_pair)
             sub_score_counts = {}
             for item in items_in_group:
                 sub_score = sub_scores[item.id]
@@ -442,7 +645,7 @@ def get_recursive_score_distribution(collection_id):
         else:
             # Subsequent levels: filter by sub-score at that level
             # Calculate sub-scores for the current group
-            sub_scores = calculate_sub_scores(current_items, comparisons)
+            sub_scores = calculate_sub_scores(current_items, comparisons, comparisons_by_pair)
             # Filter to items with target sub-score
             current_items = [item for item in current_items 
                            if sub_scores.get(item.id, 0) == target_score]
@@ -462,7 +665,7 @@ def get_recursive_score_distribution(collection_id):
             'score_path': score_path
         })
     
-    sub_scores = calculate_sub_scores(current_items, comparisons)
+    sub_scores = calculate_sub_scores(current_items, comparisons, comparisons_by_pair)
     sub_score_counts = {}
     for item in current_items:
         sub_score = sub_scores[item.id]
@@ -492,7 +695,7 @@ def get_recursive_score_distribution(collection_id):
         
         if len(items_with_sub_score) > 1:
             # Calculate sub-sub-scores
-            sub_sub_scores = calculate_sub_scores(items_with_sub_score, comparisons)
+            sub_sub_scores = calculate_sub_scores(items_with_sub_score, comparisons, comparisons_by_pair)
             sub_sub_score_counts = {}
             for item in items_with_sub_score:
                 sub_sub_score = sub_sub_scores[item.id]
@@ -631,37 +834,41 @@ def resolve_triangle(collection_id):
     if not matching_option:
         return jsonify({'error': 'Invalid resolution option'}), 400
     
-    # Apply changes
-    for change in matching_option['changes']:
-        comparison = Comparison.query.get(change['comparison_id'])
-        if not comparison:
-            return jsonify({'error': 'Comparison not found'}), 404
-        
-        # Update comparison result
-        old_result = comparison.result
-        comparison.result = change['new_result']
-        
-        # Update points for the items involved
-        item1 = db.session.get(Item, change['item1_id'])
-        item2 = db.session.get(Item, change['item2_id'])
-        
-        # Reverse old point adjustments
-        if old_result == 'item1':
-            item1.points -= 1
-            item2.points += 1
-        elif old_result == 'item2':
-            item1.points += 1
-            item2.points -= 1
-        
-        # Apply new point adjustments
-        if change['new_result'] == 'item1':
-            item1.points += 1
-            item2.points -= 1
-        elif change['new_result'] == 'item2':
-            item1.points -= 1
-            item2.points += 1
+    # Apply changes; point and result edits are flushed together at commit
+    # instead of autoflushing before each lookup in the loop
+    with db.session.no_autoflush:
+        for change in matching_option['changes']:
+            comparison = Comparison.query.get(change['comparison_id'])
+            if not comparison:
+                return jsonify({'error': 'Comparison not found'}), 404
+        
+            # Update comparison result
+            old_result = comparison.result
+            comparison.result = change['new_result']
+        
+            # Update points for the items involved
+            item1 = db.session.get(Item, change['item1_id'])
+            item2 = db.session.get(Item, change['item2_id'])
+        
+            # Reverse old point adjustments
+            if old_result == 'item1':
+                item1.points -= 1
+                item2.points += 1
+            elif old_result == 'item2':
+                item1.points += 1
+                item2.points -= 1
+        
+            # Apply new point adjustments
+            if change['new_result'] == 'item1':
+                item1.points += 1
+                item2.points -= 1
+            elif change['new_result'] == 'item2':
+                item1.points -= 1
+                item2.points += 1
     
     db.session.commit()
+    invalidate_matchup_cache(collection_id)
+    invalidate_collection_view_cache(collection_id)
     
     return jsonify({'success': True})
 
@@ -880,9 +1087,16 @@ def get_controversial_votes(collection_id):
     """Get controversial votes - votes that are inconsistent with current scores."""
     collection = Collection.query.get_or_404(collection_id)
     
-    # Get all items and comparisons
-    items_dict = {item.id: item for item in collection.items}
+    # Get all comparisons; with none there is nothing to score, so skip loading items
     comparisons = list(collection.comparisons)
+    if not comparisons:
+        return jsonify({
+            'total_controversy': 0,
+            'controversial_votes': [],
+            'total_controversial_count': 0
+        })
+    
+    items_dict = {item.id: item for item in collection.items}
     
     controversial_votes = []
     
@@ -997,9 +1211,12 @@ def get_controversial_votes(collection_id):
 @app.route('/api/collections/<int:collection_id>/matchup', methods=['GET'])
 def get_next_matchup(collection_id):
     collection = Collection.query.get_or_404(collection_id)
-    items = collection.items
+    # Count in SQL rather than loading every item just to call len() on them
+    item_count = db.session.query(db.func.count(Item.id)).filter_by(
+        collection_id=collection_id
+    ).scalar()
     
-    if len(items) < 2:
+    if item_count < 2:
         return jsonify({'error': 'Need at least 2 items for a matchup'}), 400
     
     # Check if specific item IDs were requested (query parameters)
@@ -1039,7 +1256,7 @@ def get_next_matchup(collection_id):
         })
     
     # Otherwise, get smart matchup using merge-sort-like approach
-    matchup = get_smart_matchup(collection)
+    matchup = get_cached_smart_matchup(collection)
     
     if matchup:
         return jsonify({
@@ -1057,73 +1274,84 @@ def get_next_matchup(collection_id):
     else:
         return jsonify({'message': 'All comparisons completed'}), 200
 
-@app.route('/api/collections/<int:collection_id>/matchup', methods=['POST'])
-def submit_matchup_result(collection_id):
-    collection = Collection.query.get_or_404(collection_id)
-    data = request.json
+def apply_matchup_result(collection_id, item1_id, item2_id, winner):
+    """
+    Record a vote between two items and adjust their points, without committing.
     
-    item1_id = data['item1_id']
-    item2_id = data['item2_id']
-    winner = data.get('winner')  # 'item1', 'item2', or 'tie'
+    A repeat vote on the same pair replaces the earlier result and reverses its
+    point adjustment.
     
+    Args:
+        collection_id: ID of the collection both items must belong to
+        item1_id, item2_id: IDs of the compared items, in either order
+        winner: 'item1', 'item2' or 'tie', relative to the order given
+    
+    Returns:
+        True, or False if either item isn't in the collection, in which case the
+        caller must roll back
+    """
     # Ensure consistent ordering (always store smaller ID first)
     if item1_id > item2_id:
-        item1_id, item2_id = item2_id, item1_id
-        if winner == 'item1':
-            winner = 'item2'
-        elif winner == 'item2':
-            winner = 'item1'
-    
-    # Check if comparison already exists
-    comparison = Comparison.query.filter_by(
+        item1_id, item2_id, winner = item2_id, item1_id, SWAPPED_RESULT[winner]
+    
+    # Look up the previous result, which is needed to reverse its point adjustment
+    old_result = db.session.query(Comparison.result).filter_by(
         collection_id=collection_id,
         item1_id=item1_id,
         item2_id=item2_id
-    ).first()
-    
-    old_result = None
-    if comparison:
-        # Update existing comparison
-        old_result = comparison.result
-        comparison.result = winner
-    else:
-        # Create new comparison
-        comparison = Comparison(
+    ).scalar()
+    
+    # Net point change for each item: remove the old result's adjustment and
+    # apply the new one (an unrecognised stored result was worth no points)
+    delta1, delta2 = VOTE_POINT_DELTAS.get((old_result, winner), RESULT_POINTS[winner])
+    
+    # Apply both point changes in the database with one UPDATE ... CASE, which
+    # also confirms both items belong to this collection
+    updated = db.session.execute(
+        update(Item)
+        .where(Item.id.in_([item1_id, item2_id]), Item.collection_id == collection_id)
+        .values(points=Item.points + case((Item.id == item1_id, delta1), else_=delta2))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if updated != 2:
+        return False
+    
+    # Create or update the comparison in one atomic UPSERT statement
+    db.session.execute(
+        sqlite_insert(Comparison).values(
             collection_id=collection_id,
             item1_id=item1_id,
             item2_id=item2_id,
             result=winner
+        ).on_conflict_do_update(
+            index_elements=['item1_id', 'item2_id'],
+            set_={'result': winner}
         )
-        db.session.add(comparison)
-    
-    # Update points
-    item1 = db.session.get(Item, item1_id)
-    item2 = db.session.get(Item, item2_id)
-    
-    # Remove old point adjustments if updating
-    if old_result:
-        if old_result == 'item1':
-            item1.points -= 1
-            item2.points += 1
-        elif old_result == 'item2':
-            item1.points += 1
-            item2.points -= 1
-        elif old_result == 'tie':
-            # Ties don't affect points, but we track them
-            pass
+    )
+    return True
+
+@app.route('/api/collections/<int:collection_id>/matchup', methods=['POST'])
+def submit_matchup_result(collection_id):
+    collection = Collection.query.get_or_404(collection_id)
+    data = request.json
     
-    # Apply new point adjustments
-    if winner == 'item1':
-        item1.points += 1
-        item2.points -= 1
-    elif winner == 'item2':
-        item1.points -= 1
-        item2.points += 1
-    elif winner == 'tie':
-        # Ties don't change points
-        pass
+    item1_id = data['item1_id']
+    item2_id = data['item2_id']
+    winner = data.get('winner')  # 'item1', 'item2', or 'tie'
+    
+    if winner not in ('item1', 'item2', 'tie'):
+        return jsonify({'error': "winner must be 'item1', 'item2', or 'tie'"}), 400
+    
+    if item1_id == item2_id:
+        return jsonify({'error': 'An item cannot be compared with itself'}), 400
+    
+    if not apply_matchup_result(collection_id, item1_id, item2_id, winner):
+        db.session.rollback()
+        return jsonify({'error': 'One or both items not found'}), 404
     
     db.session.commit()
+    invalidate_matchup_cache(collection_id)
+    invalidate_collection_view_cache(collection_id)
     
     return jsonify({'success': True})
 
@@ -1139,6 +1367,8 @@ def update_collection(collection_id):
         collection.search_prefix = data['search_prefix'].strip() if data['search_prefix'] else None
     
     db.session.commit()
+    invalidate_collections_list_cache()
+    invalidate_collection_view_cache(collection_id)
     
     return jsonify({
         'success': True,
@@ -1157,11 +1387,16 @@ def add_items(collection_id):
     items_text = data.get('items', '')
     items_list = [item.strip() for item in items_text.split('\n') if item.strip()]
     
-    for item_name in items_list:
-        item = Item(collection_id=collection_id, name=item_name, media_link=None)
-        db.session.add(item)
+    if items_list:
+        db.session.execute(insert(Item), [
+            {'collection_id': collection_id, 'name': item_name, 'media_link': None}
+            for item_name in items_list
+        ])
     
     db.session.commit()
+    invalidate_matchup_cache(collection_id)
+    invalidate_collection_view_cache(collection_id)
+    invalidate_collections_list_cache()
     return jsonify({'success': True, 'added': len(items_list)})
 
 def normalize_youtube_url(url):
@@ -1176,9 +1411,8 @@ def normalize_youtube_url(url):
         return url
     
     # Check if it looks like a YouTube video ID (11 characters, alphanumeric + _ and -)
-    import re
-    video_id_pattern = re.compile(r'^[a-zA-Z0-9_-]{11}$')
-    if video_id_pattern.match(url):
+    # (a length check plus a C-level set test, cheaper than a regex match)
+    if len(url) == YOUTUBE_VIDEO_ID_LENGTH and YOUTUBE_VIDEO_ID_CHARS.issuperset(url):
         # Convert video ID to full YouTube URL
         return f'https://www.youtube.com/watch?v={url}'
     
@@ -1205,7 +1439,6 @@ def auto_fill_youtube(item_id):
     
     try:
         import requests
-        import re
         import json as json_lib
         
         # Method 1: Try YouTube Data API v3 first (if API key is configured)
@@ -1230,6 +1463,7 @@ def auto_fill_youtube(item_id):
                     # Update item
                     item.media_link = normalize_youtube_url(youtube_url)
                     db.session.commit()
+                    invalidate_collection_view_cache(item.collection_id)
                     
                     return jsonify({
                         'success': True,
@@ -1244,8 +1478,6 @@ def auto_fill_youtube(item_id):
         # Method 2: Fallback - Try scraping YouTube search results
         # Note: YouTube's HTML structure changes frequently, so this may break
         try:
-            from bs4 import BeautifulSoup
-            
             search_url = f"https://www.youtube.com/results?search_query={urllib.parse.quote_plus(search_query)}"
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -1258,15 +1490,14 @@ def auto_fill_youtube(item_id):
                 # Parse HTML to find first video link
                 # Look for /watch?v=VIDEO_ID pattern in the page
                 page_text = response.text
-                # Look for /watch?v=VIDEO_ID pattern
-                video_id_pattern = r'/watch\?v=([a-zA-Z0-9_-]{11})'
-                matches = re.findall(video_id_pattern, page_text)
-                if matches:
-                    # Take the first unique video ID found
-                    video_id = matches[0]
+                # Stop at the first /watch?v=VIDEO_ID link rather than collecting them all
+                match = YOUTUBE_WATCH_LINK_RE.search(page_text)
+                if match:
+                    video_id = match.group(1)
                     youtube_url = f"https://www.youtube.com/watch?v={video_id}"
                     item.media_link = normalize_youtube_url(youtube_url)
                     db.session.commit()
+                    invalidate_collection_view_cache(item.collection_id)
                     return jsonify({
                         'success': True,
                         'item': {
@@ -1277,45 +1508,43 @@ def auto_fill_youtube(item_id):
                         }
                     })
                 
-                # Alternative: Try parsing JSON from ytInitialData
-                soup = BeautifulSoup(response.text, 'html.parser')
-                scripts = soup.find_all('script')
-                for script in scripts:
-                    if script.string and 'var ytInitialData' in script.string:
-                        match = re.search(r'var ytInitialData = ({.*?});', script.string, re.DOTALL)
-                        if match:
-                            try:
-                                data = json_lib.loads(match.group(1))
-                                # Navigate through nested structure to find first video
-                                contents = data.get('contents', {})
-                                two_column = contents.get('twoColumnSearchResultsRenderer', {})
-                                primary_contents = two_column.get('primaryContents', {})
-                                section_list = primary_contents.get('sectionListRenderer', {})
-                                contents_list = section_list.get('contents', [])
-                                
-                                for section in contents_list:
-                                    item_section = section.get('itemSectionRenderer', {})
-                                    items_list = item_section.get('contents', [])
-                                    for video_item in items_list:
-                                        video_renderer = video_item.get('videoRenderer', {})
-                                        if video_renderer:
-                                            video_id = video_renderer.get('videoId')
-                                            if video_id:
-                                                youtube_url = f"https://www.youtube.com/watch?v={video_id}"
-                                                item.media_link = normalize_youtube_url(youtube_url)
-                                                db.session.commit()
-                                                return jsonify({
-                                                    'success': True,
-                                                    'item': {
-                                                        'id': item.id,
-                                                        'name': item.name,
-                                                        'media_link': item.media_link,
-                                                        'points': item.points
-                                                    }
-                                                })
-                            except (json_lib.JSONDecodeError, KeyError, TypeError) as e:
-                                # If JSON parsing fails, continue to next method
-                                pass
+                # Alternative: Try parsing JSON from ytInitialData, found directly in
+                # the page text rather than by parsing the whole document as HTML
+                match = YOUTUBE_INITIAL_DATA_RE.search(page_text)
+                if match:
+                    try:
+                        data = json_lib.loads(match.group(1))
+                        # Navigate through nested structure to find first video
+                        contents = data.get('contents', {})
+                        two_column = contents.get('twoColumnSearchResultsRenderer', {})
+                        primary_contents = two_column.get('primaryContents', {})
+                        section_list = primary_contents.get('sectionListRenderer', {})
+                        contents_list = section_list.get('contents', [])
+                        
+                        for section in contents_list:
+                            item_section = section.get('itemSectionRenderer', {})
+                            items_list = item_section.get('contents', [])
+                            for video_item in items_list:
+                                video_renderer = video_item.get('videoRenderer', {})
+                                if video_renderer:
+                                    video_id = video_renderer.get('videoId')
+                                    if video_id:
+                                        youtube_url = f"https://www.youtube.com/watch?v={video_id}"
+                                        item.media_link = normalize_youtube_url(youtube_url)
+                                        db.session.commit()
+                                        invalidate_collection_view_cache(item.collection_id)
+                                        return jsonify({
+                                            'success': True,
+                                            'item': {
+                                                'id': item.id,
+                                                'name': item.name,
+                                                'media_link': item.media_link,
+                                                'points': item.points
+                                            }
+                                        })
+                    except (json_lib.JSONDecodeError, KeyError, TypeError) as e:
+                        # If JSON parsing fails, continue to next method
+                        pass
         except Exception as scrape_error:
             # If scraping fails, log but don't fail the request yet
             print(f"Scraping fallback failed: {scrape_error}")
@@ -1343,6 +1572,7 @@ def update_item(item_id):
         item.media_link = media_link
     
     db.session.commit()
+    invalidate_collection_view_cache(item.collection_id)
     
     return jsonify({
         'success': True,
@@ -1359,53 +1589,43 @@ def get_item_votes(item_id):
     """Get voting history for an item - wins, losses, and ties."""
     item = Item.query.get_or_404(item_id)
     
-    # Get all comparisons involving this item
-    comparisons_as_item1 = Comparison.query.filter_by(item1_id=item.id).all()
-    comparisons_as_item2 = Comparison.query.filter_by(item2_id=item.id).all()
+    # Get all comparisons involving this item together with the other item's
+    # details in a single JOIN, instead of one lookup per comparison
+    other_item = aliased(Item)
+    rows = db.session.query(
+        Comparison.id,
+        Comparison.item1_id,
+        Comparison.result,
+        other_item.id,
+        other_item.name,
+        other_item.media_link
+    ).join(other_item, or_(
+        and_(Comparison.item1_id == item.id, other_item.id == Comparison.item2_id),
+        and_(Comparison.item2_id == item.id, other_item.id == Comparison.item1_id)
+    )).filter(
+        or_(Comparison.item1_id == item.id, Comparison.item2_id == item.id)
+    ).order_by(Comparison.id).all()
     
     wins = []
     losses = []
     ties = []
     
-    # Process comparisons where item is item1
-    for comp in comparisons_as_item1:
-        other_item = db.session.get(Item, comp.item2_id)
-        if not other_item:
-            continue
-        
-        comparison_data = {
-            'other_item_id': other_item.id,
-            'other_item_name': other_item.name,
-            'other_item_media_link': other_item.media_link,
-            'comparison_id': comp.id
-        }
-        
-        if comp.result == 'item1':
-            wins.append(comparison_data)
-        elif comp.result == 'item2':
-            losses.append(comparison_data)
-        elif comp.result == 'tie':
-            ties.append(comparison_data)
-    
-    # Process comparisons where item is item2
-    for comp in comparisons_as_item2:
-        other_item = db.session.get(Item, comp.item1_id)
-        if not other_item:
-            continue
-        
+    for comparison_id, comp_item1_id, result, other_id, other_name, other_media_link in rows:
         comparison_data = {
-            'other_item_id': other_item.id,
-            'other_item_name': other_item.name,
-            'other_item_media_link': other_item.media_link,
-            'comparison_id': comp.id
+            'other_item_id': other_id,
+            'other_item_name': other_name,
+            'other_item_media_link': other_media_link,
+            'comparison_id': comparison_id
         }
         
-        if comp.result == 'item1':
-            losses.append(comparison_data)
-        elif comp.result == 'item2':
-            wins.append(comparison_data)
-        elif comp.result == 'tie':
+        if result == 'tie':
             ties.append(comparison_data)
+        elif result in ('item1', 'item2'):
+            # Whether the result is a win depends on which side this item is on
+            if (result == 'item1') == (comp_item1_id == item.id):
+                wins.append(comparison_data)
+            else:
+                losses.append(comparison_data)
     
     return jsonify({
         'item': {
@@ -1425,43 +1645,37 @@ def reset_item_votes(item_id):
     item = Item.query.get_or_404(item_id)
     collection_id = item.collection_id
     
-    # Get all comparisons involving this item
-    comparisons_as_item1 = Comparison.query.filter_by(item1_id=item.id).all()
-    comparisons_as_item2 = Comparison.query.filter_by(item2_id=item.id).all()
-    
-    reset_count = 0
-    
-    # Reset points for comparisons where item is item1
-    for comp in comparisons_as_item1:
-        other_item = db.session.get(Item, comp.item2_id)
-        if other_item:
-            # Reverse point adjustments
-            if comp.result == 'item1':
-                item.points -= 1
-                other_item.points += 1
-            elif comp.result == 'item2':
-                item.points += 1
-                other_item.points -= 1
-            # Ties don't affect points
-        db.session.delete(comp)
-        reset_count += 1
-    
-    # Reset points for comparisons where item is item2
-    for comp in comparisons_as_item2:
-        other_item = db.session.get(Item, comp.item1_id)
-        if other_item:
-            # Reverse point adjustments
-            if comp.result == 'item1':
-                item.points += 1
-                other_item.points -= 1
-            elif comp.result == 'item2':
-                item.points -= 1
-                other_item.points += 1
-            # Ties don't affect points
-        db.session.delete(comp)
-        reset_count += 1
+    # Get all comparisons involving this item as plain rows
+    involves_item = or_(Comparison.item1_id == item.id, Comparison.item2_id == item.id)
+    comparison_rows = db.session.query(
+        Comparison.item1_id, Comparison.item2_id, Comparison.result
+    ).filter(involves_item).all()
+    reset_count = len(comparison_rows)
+    
+    # Net points to reverse for every item involved (ties don't affect points)
+    point_deltas = {}
+    for item1_id, item2_id, result in comparison_rows:
+        points1, points2 = RESULT_POINTS.get(result, (0, 0))
+        point_deltas[item1_id] = point_deltas.get(item1_id, 0) - points1
+        point_deltas[item2_id] = point_deltas.get(item2_id, 0) - points2
+    
+    # One executemany UPDATE for the changed items and one DELETE for the comparisons
+    changed = [{'item_id': changed_id, 'delta': delta} for changed_id, delta in point_deltas.items() if delta]
+    if changed:
+        item_table = Item.__table__
+        db.session.execute(
+            update(item_table).where(item_table.c.id == bindparam('item_id')).values(
+                points=item_table.c.points + bindparam('delta')
+            ),
+            changed
+        )
+    db.session.execute(
+        delete(Comparison).where(involves_item).execution_options(synchronize_session=False)
+    )
     
     db.session.commit()
+    invalidate_matchup_cache(collection_id)
+    invalidate_collection_view_cache(collection_id)
     
     return jsonify({
         'success': True,
@@ -1478,38 +1692,81 @@ def delete_collection(collection_id):
     collection = Collection.query.get_or_404(collection_id)
     db.session.delete(collection)
     db.session.commit()
+    invalidate_matchup_cache(collection_id)
+    invalidate_collection_view_cache(collection_id)
+    invalidate_collections_list_cache()
     return jsonify({'success': True})
 
+# Rows fetched and encoded per chunk when streaming an export
+EXPORT_BATCH_SIZE = 500
+
+def encode_export_rows(result):
+    """
+    Encode a query result's rows as the elements of a JSON array of objects
+    keyed by column label, one chunk per batch.
+    
+    Each batch goes through json.dumps (and so the C encoder) as one list, with
+    its brackets stripped, so neither the rows nor the encoded array are ever
+    held in memory all at once.
+    """
+    separator = ''
+    for batch in result.partitions(EXPORT_BATCH_SIZE):
+        rows = [row._asdict() for row in batch]
+        yield separator + json.dumps(rows, ensure_ascii=False, separators=(',', ':'))[1:-1]
+        separator = ','
+
 @app.route('/api/collections/<int:collection_id>/export', methods=['GET'])
 def export_collection(collection_id):
     """Export a collection as JSON including all items, comparisons, and voting data."""
     collection = Collection.query.get_or_404(collection_id)
     
-    # Build export data
-    # Get item names for comparisons
-    items_dict = {item.id: item.name for item in collection.items}
-    
-    export_data = {
+    header = {
         'version': '1.0',
         'exported_at': datetime.utcnow().isoformat(),
         'collection': {
             'name': collection.name,
             'search_prefix': collection.search_prefix,
             'created_at': collection.created_at.isoformat() if collection.created_at else None
-        },
-        'items': [{
-            'name': item.name,
-            'media_link': item.media_link,
-            'points': item.points
-        } for item in collection.items],
-        'comparisons': [{
-            'item1_name': items_dict.get(comp.item1_id),
-            'item2_name': items_dict.get(comp.item2_id),
-            'result': comp.result
-        } for comp in collection.comparisons if items_dict.get(comp.item1_id) and items_dict.get(comp.item2_id)]
+        }
     }
     
-    return jsonify(export_data)
+    def generate():
+        # Stream the document section by section: the header object without its
+        # closing brace, then the items and comparisons arrays in batches
+        yield json.dumps(header, ensure_ascii=False, separators=(',', ':'))[:-1]
+        
+        # Only three columns of each item are exported, so select them as plain rows
+        # instead of hydrating a full Item object per row
+        yield ',"items":['
+        yield from encode_export_rows(
+            db.session.execute(
+                select(Item.name, Item.media_link, Item.points)
+                .where(Item.collection_id == collection_id)
+                .order_by(Item.id)
+                .execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+        )
+        
+        # Resolve comparison item names with a JOIN in SQL; the inner joins also
+        # drop any comparison whose items no longer exist, and items with blank
+        # names can't be matched up again on import
+        item1 = aliased(Item)
+        item2 = aliased(Item)
+        yield '],"comparisons":['
+        yield from encode_export_rows(
+            db.session.execute(
+                select(item1.name.label('item1_name'), item2.name.label('item2_name'), Comparison.result)
+                .select_from(Comparison)
+                .join(item1, item1.id == Comparison.item1_id)
+                .join(item2, item2.id == Comparison.item2_id)
+                .where(Comparison.collection_id == collection_id, item1.name != '', item2.name != '')
+                .order_by(Comparison.id)
+                .execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+        )
+        yield ']}'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 @app.route('/api/collections/import', methods=['POST'])
 def import_collection():
@@ -1527,66 +1784,64 @@ def import_collection():
     db.session.add(collection)
     db.session.flush()  # Get the collection ID
     
-    # Create name to item mapping for comparisons
-    name_to_item = {}
-    
-    # Import items
-    for item_data in data['items']:
-        item = Item(
-            collection_id=collection.id,
-            name=item_data['name'],
-            media_link=item_data.get('media_link'),
-            points=item_data.get('points', 0)
+    # Import items in one batched INSERT, reading the new IDs back via RETURNING
+    # to build the name to item ID mapping for comparisons
+    name_to_id = {}
+    if data['items']:
+        rows = db.session.execute(
+            insert(Item).returning(Item.id, Item.name, sort_by_parameter_order=True),
+            [{
+                'collection_id': collection.id,
+                'name': item_data['name'],
+                'media_link': item_data.get('media_link'),
+                'points': item_data.get('points', 0)
+            } for item_data in data['items']]
         )
-        db.session.add(item)
-        name_to_item[item_data['name']] = item
-    
-    db.session.flush()  # Get item IDs
+        name_to_id = {name: item_id for item_id, name in rows}
     
-    # Import comparisons if they exist
-    comparisons_imported = 0
+    # Import comparisons if they exist, collecting rows for a single batched INSERT
+    comparison_rows = []
     if 'comparisons' in data:
         for comp_data in data['comparisons']:
             item1_name = comp_data.get('item1_name')
             item2_name = comp_data.get('item2_name')
             result = comp_data.get('result')
             
-            if not item1_name or not item2_name or not result:
+            if not item1_name or not item2_name or result not in SWAPPED_RESULT:
                 continue
             
-            item1 = name_to_item.get(item1_name)
-            item2 = name_to_item.get(item2_name)
+            item1_id = name_to_id.get(item1_name)
+            item2_id = name_to_id.get(item2_name)
             
             # Skip if either item is missing or if it's the same item
-            if not item1 or not item2 or item1.id == item2.id:
+            if not item1_id or not item2_id or item1_id == item2_id:
                 continue
             
             # Ensure consistent ordering (smaller ID first)
-            item1_id, item2_id = item1.id, item2.id
             if item1_id > item2_id:
-                item1_id, item2_id = item2_id, item1_id
                 # Adjust result if we swapped
-                if result == 'item1':
-                    result = 'item2'
-                elif result == 'item2':
-                    result = 'item1'
+                item1_id, item2_id, result = item2_id, item1_id, SWAPPED_RESULT[result]
             
-            comparison = Comparison(
-                collection_id=collection.id,
-                item1_id=item1_id,
-                item2_id=item2_id,
-                result=result
-            )
-            db.session.add(comparison)
-            comparisons_imported += 1
+            comparison_rows.append({
+                'collection_id': collection.id,
+                'item1_id': item1_id,
+                'item2_id': item2_id,
+                'result': result
+            })
+    
+    if comparison_rows:
+        db.session.execute(insert(Comparison), comparison_rows)
     
     db.session.commit()
+    invalidate_matchup_cache(collection.id)
+    invalidate_collection_view_cache(collection.id)
+    invalidate_collections_list_cache()
     
     return jsonify({
         'success': True,
         'collection_id': collection.id,
         'items_imported': len(data['items']),
-        'comparisons_imported': comparisons_imported
+        'comparisons_imported': len(comparison_rows)
     }), 201
 
 def find_triangles(collection):
@@ -1914,6 +2169,127 @@ def get_triangle_resolution_options(collection, item_a_id, item_b_id, item_c_id)
     
     return options
 
+# Smart matchup cache - the suggested pair only changes when a write touches the
+# collection's comparisons, points or items, so repeated GETs between writes reuse it.
+# Maps collection_id -> (item1_id, item2_id). Every write bumps the generation; a
+# pair is only stored if no write happened while it was being computed, so a GET
+# racing a vote can't cache a suggestion computed from the pre-vote state.
+_matchup_cache = {}
+_matchup_cache_state = {'generation': 0}
+_matchup_cache_lock = threading.Lock()
+
+def invalidate_matchup_cache(collection_id):
+    """Drop the cached smart matchup for a collection after a write."""
+    with _matchup_cache_lock:
+        _matchup_cache_state['generation'] += 1
+        _matchup_cache.pop(collection_id, None)
+
+def get_cached_smart_matchup(collection):
+    """
+    Return the smart matchup for a collection, reusing the last suggestion
+    if nothing has been written to the collection since it was computed.
+    
+    Returns:
+        Tuple of (item1, item2) Item objects, or None if all comparisons are done
+    """
+    with _matchup_cache_lock:
+        generation = _matchup_cache_state['generation']
+        matchup_ids = _matchup_cache.get(collection.id)
+    
+    if not matchup_ids:
+        matchup_ids = get_smart_matchup(collection)
+        if not matchup_ids:
+            return None
+        with _matchup_cache_lock:
+            if _matchup_cache_state['generation'] == generation:
+                _matchup_cache[collection.id] = matchup_ids
+    
+    # Only the two suggested items are needed, not the whole collection
+    items_by_id = {item.id: item for item in Item.query.filter(
+        Item.id.in_(matchup_ids), Item.collection_id == collection.id
+    )}
+    if matchup_ids[0] not in items_by_id or matchup_ids[1] not in items_by_id:
+        # A cached pair whose items are gone; recompute from the current items
+        invalidate_matchup_cache(collection.id)
+        return get_cached_smart_matchup(collection)
+    
+    return (items_by_id[matchup_ids[0]], items_by_id[matchup_ids[1]])
+
+def find_uncompared_pair(collection_id):
+    """
+    Find the first pair of items in a collection that hasn't been compared yet.
+    
+    The anti-join runs in SQL against the unique (item1_id, item2_id) index and
+    stops at the first hit, so the k*(k-1)/2 candidate pairs are never built in Python.
+    
+    Returns:
+        Tuple of (item1_id, item2_id) with item1_id < item2_id, or None
+    """
+    item1 = aliased(Item)
+    item2 = aliased(Item)
+    already_compared = db.session.query(Comparison.id).filter(
+        Comparison.item1_id == item1.id,
+        Comparison.item2_id == item2.id
+    ).exists()
+    
+    pair = db.session.query(item1.id, item2.id).join(
+        item2, and_(item2.collection_id == item1.collection_id, item2.id > item1.id)
+    ).filter(
+        item1.collection_id == collection_id,
+        ~already_compared
+    ).order_by(item1.id, item2.id).first()
+    
+    return tuple(pair) if pair else None
+
+def pick_best_pair(group_ids, group_counts, compared):
+    """
+    Pick the best uncompared pair within a group of items.
+    
+    Works on plain lists of IDs and comparison counts rather than ORM objects so
+    the quadratic pair loop does no attribute access.
+    
+    Args:
+        group_ids: List of item IDs in the group
+        group_counts: List of comparison counts, parallel to group_ids
+        compared: Container of already-compared (smaller_id, larger_id) pairs
+    
+    Returns:
+        Tuple of (item1_id, item2_id) in group order, or None if every pair is compared
+    """
+    import random
+    from itertools import combinations
+    
+    # Track the best (max_comparisons, total_comparisons) key seen so far and
+    # every pair tied at it, in one pass without building a list of all pairs.
+    # combinations() enumerates the i < j pairs in C.
+    best_key = None
+    best_pairs = []
+    for (id1, item1_comparisons), (id2, item2_comparisons) in combinations(zip(group_ids, group_counts), 2):
+        matchup_key = (id1, id2) if id1 < id2 else (id2, id1)
+        
+        # Skip if already compared
+        if matchup_key in compared:
+            continue
+        
+        # Priority key: (max_comparisons, total_comparisons)
+        # Lower values = higher priority
+        priority_key = (
+            max(item1_comparisons, item2_comparisons),  # Primary: prefer items with fewer
+            item1_comparisons + item2_comparisons       # Secondary: total comparisons
+        )
+        
+        if best_key is None or priority_key < best_key:
+            best_key = priority_key
+            best_pairs = [(id1, id2)]
+        elif priority_key == best_key:
+            best_pairs.append((id1, id2))
+    
+    if not best_pairs:
+        return None
+    
+    # Randomize among equally good pairs for better distribution
+    return random.choice(best_pairs)
+
 # Smart matchup algorithm - prioritizes largest tied groups
 def get_smart_matchup(collection):
     """
@@ -1926,118 +2302,86 @@ def get_smart_matchup(collection):
     3. Select matchups from within that subset
     4. Within the selected subset, prefer items with fewer comparisons
     5. Randomize for better distribution
+    
+    Returns:
+        Tuple of (item1_id, item2_id), or None if all comparisons are done
     """
-    import random
+    from collections import Counter
     
-    items = list(collection.items)
-    comparisons = {frozenset({c.item1_id, c.item2_id}): c.result 
-                   for c in collection.comparisons}
+    # Size every score group in SQL: GROUP BY over the (collection_id, points DESC, id)
+    # index returns one row per distinct score instead of one row per item
+    score_counts = dict(db.session.query(Item.points, db.func.count(Item.id)).filter(
+        Item.collection_id == collection.id
+    ).group_by(Item.points).all())
     
-    if len(items) < 2:
+    if sum(score_counts.values()) < 2:
         return None
     
-    # Count comparisons per item
-    item_comparison_counts = {}
-    for item in items:
-        item_comparison_counts[item.id] = sum(
-            1 for c in comparisons.keys() if item.id in c
+    # Already-compared pairs as (smaller_id, larger_id) tuples, which are
+    # cheaper to build and hash than frozensets
+    comparisons = {
+        (item1_id, item2_id) if item1_id < item2_id else (item2_id, item1_id)
+        for item1_id, item2_id in db.session.query(Comparison.item1_id, Comparison.item2_id).filter(
+            Comparison.collection_id == collection.id
         )
+    }
     
-    # Group items by score
-    items_by_score = {}
-    for item in items:
-        score = item.points
-        if score not in items_by_score:
-            items_by_score[score] = []
-        items_by_score[score].append(item)
+    # Count comparisons per item in a single pass over the compared pairs
+    item_comparison_counts = Counter()
+    for a_id, b_id in comparisons:
+        item_comparison_counts[a_id] += 1
+        item_comparison_counts[b_id] += 1
     
     # Find the largest subset(s) of items with the same score
-    max_group_size = max(len(group) for group in items_by_score.values())
-    largest_groups = [(score, group) for score, group in items_by_score.items() 
-                      if len(group) == max_group_size]
+    max_group_size = max(score_counts.values())
+    largest_scores = [score for score, group_size in score_counts.items()
+                      if group_size == max_group_size]
     
     # If multiple groups have the same size, prioritize the one with smallest absolute value
     # Tie-breaking: 0, then 1, -1, then 2, -2, then 3, -3, etc.
     # (smallest absolute value first, then positive over negative)
-    def tie_break_key(score_group_pair):
-        score = score_group_pair[0]
+    def tie_break_key(score):
         abs_score = abs(score)
         # Return tuple: (absolute_value, is_negative)
         # This sorts: 0, 1, -1, 2, -2, 3, -3, ...
         return (abs_score, score < 0)
     
-    largest_groups.sort(key=tie_break_key)
-    target_score, target_group = largest_groups[0]
+    # Only the first score in that order is needed, so take the minimum
+    target_score = min(largest_scores, key=tie_break_key)
+    # Only the chosen group's item IDs are loaded
+    target_group = [item_id for (item_id,) in db.session.query(Item.id).filter(
+        Item.collection_id == collection.id,
+        Item.points == target_score
+    ).order_by(Item.id)]
     
     # If the target group has fewer than 2 items, we can't create a matchup from it
     # This shouldn't happen if we're selecting correctly, but handle it gracefully
     if len(target_group) < 2:
         # Fall back to finding any possible matchup
-        for i in range(len(items)):
-            for j in range(i + 1, len(items)):
-                item1, item2 = items[i], items[j]
-                matchup_key = frozenset({item1.id, item2.id})
-                if matchup_key not in comparisons:
-                    return (item1, item2)
-        return None
+        return find_uncompared_pair(collection.id)
     
-    # Get all possible matchups within the target group
-    possible_matchups = []
-    for i in range(len(target_group)):
-        for j in range(i + 1, len(target_group)):
-            item1, item2 = target_group[i], target_group[j]
-            matchup_key = frozenset({item1.id, item2.id})
-            
-            # Skip if already compared
-            if matchup_key in comparisons:
-                continue
-            
-            # Count comparisons for each item
-            item1_comparisons = item_comparison_counts.get(item1.id, 0)
-            item2_comparisons = item_comparison_counts.get(item2.id, 0)
-            total_comparisons = item1_comparisons + item2_comparisons
-            max_comparisons = max(item1_comparisons, item2_comparisons)
-            
-            # Priority tuple: (max_comparisons, total_comparisons, random)
-            # Lower values = higher priority
-            random_tiebreaker = random.random()
-            
-            priority_tuple = (
-                max_comparisons,   # Primary: max comparisons (prefer items with fewer)
-                total_comparisons, # Secondary: total comparisons
-                random_tiebreaker  # Tertiary: random for distribution
-            )
-            
-            possible_matchups.append((priority_tuple, (item1, item2)))
+    # If every pair in the target group has already been compared, skip the
+    # quadratic pair loop: one pass over the comparisons is enough to tell
+    group_size = len(target_group)
+    group_ids = set(target_group)
+    compared_in_group = sum(1 for a_id, b_id in comparisons if a_id in group_ids and b_id in group_ids)
+    if compared_in_group >= group_size * (group_size - 1) // 2:
+        return find_uncompared_pair(collection.id)
     
-    # If no matchups available in target group, look for any unmatched pair
-    if not possible_matchups:
-        for i in range(len(items)):
-            for j in range(i + 1, len(items)):
-                item1, item2 = items[i], items[j]
-                matchup_key = frozenset({item1.id, item2.id})
-                if matchup_key not in comparisons:
-                    return (item1, item2)
-        return None
-    
-    # Sort by priority tuple (lower is better)
-    possible_matchups.sort(key=lambda x: x[0])
-    
-    # Group by primary criteria (max_comparisons)
-    best_max_comparisons = possible_matchups[0][0][0]
-    best_matchups = [m for m in possible_matchups if m[0][0] == best_max_comparisons]
+    # Read each item's comparison count once up front so the pair loop only
+    # indexes plain lists instead of hitting dicts
+    group_counts = [item_comparison_counts[item_id] for item_id in target_group]
     
-    # If multiple matchups with same max_comparisons, filter by total_comparisons
-    if len(best_matchups) > 1:
-        best_matchups.sort(key=lambda x: x[0][1])  # Sort by total_comparisons
-        best_total_comparisons = best_matchups[0][0][1]
-        best_matchups = [m for m in best_matchups if m[0][1] == best_total_comparisons]
+    best_pair = pick_best_pair(target_group, group_counts, comparisons)
     
-    # If still multiple, use random selection from the best group
-    selected = random.choice(best_matchups)
+    # If no matchups available in target group, look for any unmatched pair
+    if best_pair is None:
+        return find_uncompared_pair(collection.id)
     
-    # Return the matchup (item1, item2)
-    return selected[1]
+    return best_pair
+
+# Bump when adding a migration below so existing SQLite databases re-run the checks
+SCHEMA_VERSION = 1
 
 # Initialize database (only if not in testing mode)
 # This prevents tests from accidentally creating/modifying production database
@@ -2045,26 +2389,38 @@ if not os.environ.get('TESTING') and not app.config.get('TESTING'):
     with app.app_context():
         db.create_all()
         
-        # Migration: Add columns if they don't exist (for existing databases)
+        # Migration: Add columns and indexes if they don't exist (for existing databases).
+        # All checks share one connection; on SQLite, PRAGMA user_version records that
+        # they have run so later starts skip the schema inspection entirely.
         try:
             from sqlalchemy import inspect, text
-            inspector = inspect(db.engine)
+            is_sqlite = db.engine.dialect.name == 'sqlite'
             
-            # Migration: Add media_link column if it doesn't exist
-            item_columns = [col['name'] for col in inspector.get_columns('item')]
-            if 'media_link' not in item_columns:
-                with db.engine.connect() as conn:
-                    conn.execute(text('ALTER TABLE item ADD COLUMN media_link VARCHAR(1000)'))
-                    conn.commit()
-                print("✓ Added media_link column to existing database")
-            
-            # Migration: Add search_prefix column if it doesn't exist
-            collection_columns = [col['name'] for col in inspector.get_columns('collection')]
-            if 'search_prefix' not in collection_columns:
-                with db.engine.connect() as conn:
-                    conn.execute(text('ALTER TABLE collection ADD COLUMN search_prefix VARCHAR(200)'))
-                    conn.commit()
-                print("✓ Added search_prefix column to existing database")
+            with db.engine.begin() as conn:
+                needs_migration = (not is_sqlite or
+                                   conn.execute(text('PRAGMA user_version')).scalar() < SCHEMA_VERSION)
+                if needs_migration:
+                    inspector = inspect(conn)
+                    
+                    # Migration: Add media_link column if it doesn't exist
+                    item_columns = [col['name'] for col in inspector.get_columns('item')]
+                    if 'media_link' not in item_columns:
+                        conn.execute(text('ALTER TABLE item ADD COLUMN media_link VARCHAR(1000)'))
+                        print("✓ Added media_link column to existing database")
+                    
+                    # Migration: Add search_prefix column if it doesn't exist
+                    collection_columns = [col['name'] for col in inspector.get_columns('collection')]
+                    if 'search_prefix' not in collection_columns:
+                        conn.execute(text('ALTER TABLE collection ADD COLUMN search_prefix VARCHAR(200)'))
+                        print("✓ Added search_prefix column to existing database")
+                    
+                    # Migration: Add indexes if they don't exist (create_all skips existing tables)
+                    conn.execute(text('CREATE INDEX IF NOT EXISTS ix_item_collection_ranking ON item (collection_id, points DESC, id)'))
+                    conn.execute(text('CREATE INDEX IF NOT EXISTS ix_comparison_collection_pair ON comparison (collection_id, item1_id, item2_id)'))
+                    conn.execute(text('CREATE INDEX IF NOT EXISTS ix_comparison_item2 ON comparison (item2_id)'))
+                    
+                    if is_sqlite:
+                        conn.execute(text(f'PRAGMA user_version = {SCHEMA_VERSION}'))
         except Exception as e:
             # If migration fails, it's likely a new database or the column already exists
             pass
@@ -6,29 +6,57 @@ import os
 # This must happen before any app imports
 os.environ['TESTING'] = '1'
 
-from app import app, db
+from sqlalchemy import select
 
-@pytest.fixture(scope='function', autouse=True)
-def test_database():
+from app import (
+    app, db, Item, apply_matchup_result,
+    invalidate_collections_list_cache, invalidate_matchup_cache, invalidate_collection_view_cache
+)
+
+@pytest.fixture(scope='session')
+def database_schema():
     """
-    Create a temporary database for each test function.
-    This ensures tests never touch the production database.
+    Create the schema once for the whole test session.
     
     NOTE: Since TESTING=1 is set before app import, app.py already uses :memory: database.
-    We just need to ensure clean state for each test.
+    The in-memory database lives on a single shared connection, so tables created here
+    persist until the session ends.
     """
     with app.app_context():
-        # Drop all tables first to ensure clean state
         db.drop_all()
-        # Create all tables fresh
         db.create_all()
         
         yield
         
-        # Cleanup after test
         db.drop_all()
         db.session.remove()
 
+@pytest.fixture(scope='function', autouse=True)
+def test_database(database_schema):
+    """
+    Give each test function an empty database.
+    This ensures tests never touch the production database.
+    
+    Rows are deleted after each test instead of dropping and recreating every
+    table, which keeps schema DDL out of the per-test cost.
+    
+    The app context stays pushed for the whole test, so tests can use the ORM
+    directly and test client requests reuse it instead of pushing their own.
+    """
+    with app.app_context():
+        # The collections listing is cached in-process; the emptied database makes it stale
+        invalidate_collections_list_cache()
+        
+        yield
+        
+        # Cleanup after test: discard anything uncommitted, then empty every
+        # table (children first so foreign keys are never left dangling)
+        db.session.rollback()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+        db.session.remove()
+
 @pytest.fixture
 def client(test_database):
     """Create a test client with a temporary in-memory database."""
@@ -47,3 +75,27 @@ def sample_collection(client):
     collection_id = response.get_json()['id']
     return collection_id
 
+@pytest.fixture
+def item_ids(sample_collection):
+    """IDs of the sample collection's items, in creation order."""
+    return db.session.execute(
+        select(Item.id).where(Item.collection_id == sample_collection).order_by(Item.id)
+    ).scalars().all()
+
+@pytest.fixture
+def seed_comparisons(test_database):
+    """
+    Return a function that records votes without going through the test client.
+    
+    seed_comparisons(collection_id, [(item1_id, item2_id, winner), ...]) applies
+    each vote with the matchup endpoint's own apply_matchup_result and commits
+    once, instead of making one request per vote.
+    """
+    def seed(collection_id, votes):
+        for item1_id, item2_id, winner in votes:
+            assert apply_matchup_result(collection_id, item1_id, item2_id, winner)
+        db.session.commit()
+        invalidate_matchup_cache(collection_id)
+        invalidate_collection_view_cache(collection_id)
+    
+    return seed
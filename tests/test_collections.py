@@ -31,6 +31,59 @@ def test_get_collections(client, sample_collection):
     assert any(c['name'] == 'Test Collection' for c in collections)
     assert any(c['name'] == 'Second Collection' for c in collections)
 
+def test_get_collections_item_count(client, sample_collection):
+    """Test that the collections listing reports item counts, including empty collections."""
+    client.post('/api/collections',
+        json={'name': 'Empty Collection', 'items': ''},
+        content_type='application/json'
+    )
+    
+    response = client.get('/api/collections')
+    assert response.status_code == 200
+    counts = {c['name']: c['item_count'] for c in response.get_json()}
+    assert counts['Test Collection'] == 4
+    assert counts['Empty Collection'] == 0
+
+def test_get_collections_reflects_writes(client, sample_collection):
+    """Test that the cached collections listing is refreshed after writes."""
+    response = client.get('/api/collections')
+    assert response.get_json()[0]['item_count'] == 4
+    
+    client.post(f'/api/collections/{sample_collection}/items',
+        json={'items': 'Elderberry'},
+        content_type='application/json'
+    )
+    client.put(f'/api/collections/{sample_collection}',
+        json={'name': 'Renamed Collection'},
+        content_type='application/json'
+    )
+    
+    collection = client.get('/api/collections').get_json()[0]
+    assert collection['item_count'] == 5
+    assert collection['name'] == 'Renamed Collection'
+    
+    client.delete(f'/api/collections/{sample_collection}')
+    assert client.get('/api/collections').get_json() == []
+
+def test_get_collection_reflects_writes(client, sample_collection):
+    """Test that the cached collection view is refreshed after votes and edits."""
+    items = client.get(f'/api/collections/{sample_collection}').get_json()['items']
+    item1_id, item2_id = items[0]['id'], items[1]['id']
+    
+    client.post(f'/api/collections/{sample_collection}/matchup',
+        json={'item1_id': item1_id, 'item2_id': item2_id, 'winner': 'item2'},
+        content_type='application/json'
+    )
+    client.put(f'/api/items/{item1_id}',
+        json={'name': 'Apricot'},
+        content_type='application/json'
+    )
+    
+    data = client.get(f'/api/collections/{sample_collection}').get_json()
+    assert data['comparisons_count'] == 1
+    assert data['items'][0]['id'] == item2_id
+    assert data['items'][-1] == {'id': item1_id, 'name': 'Apricot', 'media_link': None, 'points': -1}
+
 def test_get_collection(client, sample_collection):
     """Test retrieving a specific collection."""
     response = client.get(f'/api/collections/{sample_collection}')
@@ -42,6 +95,24 @@ def test_get_collection(client, sample_collection):
     assert data['items'][0]['name'] == 'Apple'
     assert data['items'][1]['name'] == 'Banana'
 
+def test_get_collection_comparisons_count_without_ties(client):
+    """Test that comparisons_count is reported when every item has a unique score."""
+    response = client.post('/api/collections',
+        json={'name': 'Pair', 'items': 'First\nSecond'},
+        content_type='application/json'
+    )
+    collection_id = response.get_json()['id']
+    items = client.get(f'/api/collections/{collection_id}').get_json()['items']
+    
+    client.post(f'/api/collections/{collection_id}/matchup',
+        json={'item1_id': items[0]['id'], 'item2_id': items[1]['id'], 'winner': 'item1'},
+        content_type='application/json'
+    )
+    
+    data = client.get(f'/api/collections/{collection_id}').get_json()
+    assert [item['points'] for item in data['items']] == [1, -1]
+    assert data['comparisons_count'] == 1
+
 def test_get_collection_not_found(client):
     """Test retrieving a non-existent collection."""
     response = client.get('/api/collections/999')
@@ -3,76 +3,68 @@ import pytest
 import json
 from app import db, Item, Comparison
 
-def test_export_collection(client, sample_collection):
+def test_export_collection(client, sample_collection, item_ids):
     """Test exporting a collection with items and comparisons."""
-    with client.application.app_context():
-        items = Item.query.filter_by(collection_id=sample_collection).all()
-        item_ids = [item.id for item in items]
-        
-        # Add some comparisons
-        client.post(f'/api/collections/{sample_collection}/matchup',
-            json={'item1_id': item_ids[0], 'item2_id': item_ids[1], 'winner': 'item1'},
-            content_type='application/json'
-        )
-        client.post(f'/api/collections/{sample_collection}/matchup',
-            json={'item1_id': item_ids[1], 'item2_id': item_ids[2], 'winner': 'item1'},
-            content_type='application/json'
-        )
-        
-        # Export the collection
-        response = client.get(f'/api/collections/{sample_collection}/export')
-        assert response.status_code == 200
-        
-        data = response.get_json()
-        
-        # Verify structure
-        assert 'version' in data
-        assert 'exported_at' in data
-        assert 'collection' in data
-        assert 'items' in data
-        assert 'comparisons' in data
-        
-        # Verify collection data
-        assert data['collection']['name'] == 'Test Collection'
-        
-        # Verify items
-        assert len(data['items']) == 4
-        item_names = [item['name'] for item in data['items']]
-        assert 'Apple' in item_names
-        assert 'Banana' in item_names
-        assert 'Cherry' in item_names
-        assert 'Date' in item_names
-        
-        # Verify comparisons
-        assert len(data['comparisons']) == 2
-        
-        # Verify one comparison structure
-        comp = data['comparisons'][0]
-        assert 'item1_name' in comp
-        assert 'item2_name' in comp
-        assert 'result' in comp
-        assert comp['result'] in ['item1', 'item2', 'tie']
+    # Add some comparisons
+    client.post(f'/api/collections/{sample_collection}/matchup',
+        json={'item1_id': item_ids[0], 'item2_id': item_ids[1], 'winner': 'item1'},
+        content_type='application/json'
+    )
+    client.post(f'/api/collections/{sample_collection}/matchup',
+        json={'item1_id': item_ids[1], 'item2_id': item_ids[2], 'winner': 'item1'},
+        content_type='application/json'
+    )
+    
+    # Export the collection
+    response = client.get(f'/api/collections/{sample_collection}/export')
+    assert response.status_code == 200
+    
+    data = response.get_json()
+    
+    # Verify structure
+    assert 'version' in data
+    assert 'exported_at' in data
+    assert 'collection' in data
+    assert 'items' in data
+    assert 'comparisons' in data
+    
+    # Verify collection data
+    assert data['collection']['name'] == 'Test Collection'
+    
+    # Verify items
+    assert len(data['items']) == 4
+    item_names = [item['name'] for item in data['items']]
+    assert 'Apple' in item_names
+    assert 'Banana' in item_names
+    assert 'Cherry' in item_names
+    assert 'Date' in item_names
+    
+    # Verify comparisons
+    assert len(data['comparisons']) == 2
+    
+    # Verify one comparison structure
+    comp = data['comparisons'][0]
+    assert 'item1_name' in comp
+    assert 'item2_name' in comp
+    assert 'result' in comp
+    assert comp['result'] in ['item1', 'item2', 'tie']
 
-def test_export_collection_with_points(client, sample_collection):
+def test_export_collection_with_points(client, sample_collection, item_ids):
     """Test that exported items include their points."""
-    with client.application.app_context():
-        items = Item.query.filter_by(collection_id=sample_collection).all()
-        item_ids = [item.id for item in items]
-        
-        # Create comparisons that affect points
-        client.post(f'/api/collections/{sample_collection}/matchup',
-            json={'item1_id': item_ids[0], 'item2_id': item_ids[1], 'winner': 'item1'},
-            content_type='application/json'
-        )
-        
-        # Export
-        response = client.get(f'/api/collections/{sample_collection}/export')
-        data = response.get_json()
-        
-        # Verify points are included
-        for item in data['items']:
-            assert 'points' in item
-            assert isinstance(item['points'], int)
+    # Create comparisons that affect points
+    client.post(f'/api/collections/{sample_collection}/matchup',
+        json={'item1_id': item_ids[0], 'item2_id': item_ids[1], 'winner': 'item1'},
+        content_type='application/json'
+    )
+    
+    # Export
+    response = client.get(f'/api/collections/{sample_collection}/export')
+    data = response.get_json()
+    
+    # Verify points are included
+    for item in data['items']:
+        assert 'points' in item
+        assert isinstance(item['points'], int)
 
 def test_export_collection_with_media_links(client):
     """Test that exported items include media links."""
@@ -83,12 +75,11 @@ def test_export_collection_with_media_links(client):
     collection_id = response.get_json()['id']
     
     # Add media links to items
-    with client.application.app_context():
-        items = Item.query.filter_by(collection_id=collection_id).all()
-        items[0].media_link = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
-        items[1].media_link = 'dQw4w9WgXcQ'  # Just video ID
-        db.session.commit()
-    
+    items = Item.query.filter_by(collection_id=collection_id).all()
+    items[0].media_link = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+    items[1].media_link = 'dQw4w9WgXcQ'  # Just video ID
+    db.session.commit()
+
     # Export
     response = client.get(f'/api/collections/{collection_id}/export')
     data = response.get_json()
@@ -97,6 +88,33 @@ def test_export_collection_with_media_links(client):
     assert data['items'][0]['media_link'] == 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
     assert data['items'][1]['media_link'] == 'dQw4w9WgXcQ'
 
+def test_export_collection_streams_in_batches(client, sample_collection, item_ids, seed_comparisons, monkeypatch):
+    """Test that an export spanning several row batches is still one valid document."""
+    import app as app_module
+    monkeypatch.setattr(app_module, 'EXPORT_BATCH_SIZE', 3)
+    
+    seed_comparisons(sample_collection, [
+        (item_ids[0], item_ids[1], 'item1'),
+        (item_ids[0], item_ids[2], 'tie'),
+        (item_ids[1], item_ids[3], 'item2'),
+        (item_ids[2], item_ids[3], 'item1'),
+    ])
+    
+    data = client.get(f'/api/collections/{sample_collection}/export').get_json()
+    assert [item['name'] for item in data['items']] == ['Apple', 'Banana', 'Cherry', 'Date']
+    assert data['comparisons'] == [
+        {'item1_name': 'Apple', 'item2_name': 'Banana', 'result': 'item1'},
+        {'item1_name': 'Apple', 'item2_name': 'Cherry', 'result': 'tie'},
+        {'item1_name': 'Banana', 'item2_name': 'Date', 'result': 'item2'},
+        {'item1_name': 'Cherry', 'item2_name': 'Date', 'result': 'item1'},
+    ]
+    
+    # A collection without items or comparisons exports empty arrays
+    response = client.post('/api/collections', json={'name': 'Empty', 'items': ''})
+    data = client.get(f'/api/collections/{response.get_json()["id"]}/export').get_json()
+    assert data['items'] == []
+    assert data['comparisons'] == []
+
 def test_import_collection_basic(client):
     """Test importing a basic collection with items only."""
     import_data = {
@@ -214,22 +232,18 @@ def test_import_collection_invalid_data(client):
     )
     assert response.status_code == 400
 
-def test_export_import_roundtrip(client, sample_collection):
+def test_export_import_roundtrip(client, sample_collection, item_ids):
     """Test that exporting and then importing produces equivalent data."""
-    with client.application.app_context():
-        items = Item.query.filter_by(collection_id=sample_collection).all()
-        item_ids = [item.id for item in items]
-        
-        # Add comparisons
-        client.post(f'/api/collections/{sample_collection}/matchup',
-            json={'item1_id': item_ids[0], 'item2_id': item_ids[1], 'winner': 'item1'},
-            content_type='application/json'
-        )
-        client.post(f'/api/collections/{sample_collection}/matchup',
-            json={'item1_id': item_ids[0], 'item2_id': item_ids[2], 'winner': 'item1'},
-            content_type='application/json'
-        )
-    
+    # Add comparisons
+    client.post(f'/api/collections/{sample_collection}/matchup',
+        json={'item1_id': item_ids[0], 'item2_id': item_ids[1], 'winner': 'item1'},
+        content_type='application/json'
+    )
+    client.post(f'/api/collections/{sample_collection}/matchup',
+        json={'item1_id': item_ids[0], 'item2_id': item_ids[2], 'winner': 'item1'},
+        content_type='application/json'
+    )
+
     # Export
     export_response = client.get(f'/api/collections/{sample_collection}/export')
     export_data = export_response.get_json()
@@ -289,3 +303,30 @@ def test_import_handles_missing_comparison_items(client):
     # Only valid comparisons should be imported (1 valid, 2 invalid)
     assert data['comparisons_imported'] == 1
 
+def test_import_skips_unknown_comparison_results(client):
+    """Test that import skips comparisons whose result isn't item1, item2 or tie."""
+    import_data = {
+        'version': '1.0',
+        'collection': {'name': 'Test'},
+        'items': [
+            {'name': 'Item 1', 'media_link': None, 'points': 0},
+            {'name': 'Item 2', 'media_link': None, 'points': 0},
+            {'name': 'Item 3', 'media_link': None, 'points': 0}
+        ],
+        'comparisons': [
+            {'item1_name': 'Item 1', 'item2_name': 'Item 2', 'result': 'draw'},
+            {'item1_name': 'Item 3', 'item2_name': 'Item 1', 'result': None},
+            {'item1_name': 'Item 2', 'item2_name': 'Item 3', 'result': 'tie'}  # Valid
+        ]
+    }
+    
+    response = client.post('/api/collections/import',
+        json=import_data,
+        content_type='application/json'
+    )
+    
+    assert response.status_code == 201
+    data = response.get_json()
+    assert data['comparisons_imported'] == 1
+    assert [c.result for c in Comparison.query.filter_by(collection_id=data['collection_id'])] == ['tie']
+
@@ -58,6 +58,18 @@ def test_update_item_media_link_video_id(client, sample_collection):
         # Should normalize to full URL
         assert data['item']['media_link'] == 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
 
+def test_update_item_media_link_not_video_id(client, sample_collection):
+    """Test that an 11-character link with characters outside a video ID is left as-is."""
+    with client.application.app_context():
+        item_id = Item.query.filter_by(collection_id=sample_collection).first().id
+        
+        response = client.patch(f'/api/items/{item_id}',
+            json={'media_link': 'dQw4w9WgX.Q'},
+            content_type='application/json'
+        )
+        assert response.status_code == 200
+        assert response.get_json()['item']['media_link'] == 'dQw4w9WgX.Q'
+
 def test_update_item_clear_media_link(client, sample_collection):
     """Test clearing media link by setting to empty string."""
     with client.application.app_context():
@@ -57,39 +57,38 @@ def test_submit_matchup_result(client, sample_collection):
 
 def test_matchup_point_system(client, sample_collection):
     """Test the point system for multiple matchups."""
-    with client.application.app_context():
-        items = Item.query.filter_by(collection_id=sample_collection).all()
-        item_ids = [item.id for item in items]
-        
-        # Item 0 beats Item 1
-        client.post(f'/api/collections/{sample_collection}/matchup',
-            json={'item1_id': item_ids[0], 'item2_id': item_ids[1], 'winner': 'item1'},
-            content_type='application/json'
-        )
-        
-        # Item 1 beats Item 2
-        client.post(f'/api/collections/{sample_collection}/matchup',
-            json={'item1_id': item_ids[1], 'item2_id': item_ids[2], 'winner': 'item1'},
-            content_type='application/json'
-        )
-        
-        # Item 0 beats Item 2
-        client.post(f'/api/collections/{sample_collection}/matchup',
-            json={'item1_id': item_ids[0], 'item2_id': item_ids[2], 'winner': 'item1'},
-            content_type='application/json'
-        )
-        
-        # Check points
-        collection_response = client.get(f'/api/collections/{sample_collection}')
-        items_data = collection_response.get_json()['items']
-        
-        item0 = next(i for i in items_data if i['id'] == item_ids[0])
-        item1 = next(i for i in items_data if i['id'] == item_ids[1])
-        item2 = next(i for i in items_data if i['id'] == item_ids[2])
-        
-        assert item0['points'] == 2  # Beat 2 items
-        assert item1['points'] == 0   # Beat 1, lost to 1
-        assert item2['points'] == -2  # Lost to 2 items
+    items = Item.query.filter_by(collection_id=sample_collection).all()
+    item_ids = [item.id for item in items]
+    
+    # Item 0 beats Item 1
+    client.post(f'/api/collections/{sample_collection}/matchup',
+        json={'item1_id': item_ids[0], 'item2_id': item_ids[1], 'winner': 'item1'},
+        content_type='application/json'
+    )
+    
+    # Item 1 beats Item 2
+    client.post(f'/api/collections/{sample_collection}/matchup',
+        json={'item1_id': item_ids[1], 'item2_id': item_ids[2], 'winner': 'item1'},
+        content_type='application/json'
+    )
+    
+    # Item 0 beats Item 2
+    client.post(f'/api/collections/{sample_collection}/matchup',
+        json={'item1_id': item_ids[0], 'item2_id': item_ids[2], 'winner': 'item1'},
+        content_type='application/json'
+    )
+    
+    # Check points
+    collection_response = client.get(f'/api/collections/{sample_collection}')
+    items_data = collection_response.get_json()['items']
+    
+    item0 = next(i for i in items_data if i['id'] == item_ids[0])
+    item1 = next(i for i in items_data if i['id'] == item_ids[1])
+    item2 = next(i for i in items_data if i['id'] == item_ids[2])
+    
+    assert item0['points'] == 2  # Beat 2 items
+    assert item1['points'] == 0   # Beat 1, lost to 1
+    assert item2['points'] == -2  # Lost to 2 items
 
 def test_tie_matchup(client, sample_collection):
     """Test that ties don't affect points."""
@@ -151,51 +150,139 @@ def test_update_matchup_result(client, sample_collection):
 
 def test_matchup_ordering_consistency(client, sample_collection):
     """Test that matchup ordering is handled consistently (smaller ID first)."""
-    with client.application.app_context():
-        items = Item.query.filter_by(collection_id=sample_collection).all()
-        item_ids = sorted([item.id for item in items])
-        
-        # Submit with larger ID first
+    items = Item.query.filter_by(collection_id=sample_collection).all()
+    item_ids = sorted([item.id for item in items])
+    
+    # Submit with larger ID first
+    client.post(f'/api/collections/{sample_collection}/matchup',
+        json={'item1_id': item_ids[1], 'item2_id': item_ids[0], 'winner': 'item2'},
+        content_type='application/json'
+    )
+    
+    # Verify the result is stored correctly
+    comparison = Comparison.query.filter_by(
+        collection_id=sample_collection,
+        item1_id=item_ids[0],  # Should be stored with smaller ID first
+        item2_id=item_ids[1]
+    ).first()
+    assert comparison is not None
+    assert comparison.result == 'item1'  # Winner should be adjusted
+
+def test_all_comparisons_completed(client, sample_collection):
+    """Test that matchup endpoint indicates when all comparisons are done."""
+    items = Item.query.filter_by(collection_id=sample_collection).all()
+    item_ids = [item.id for item in items]
+    
+    # Complete all possible comparisons (4 items = 6 comparisons)
+    comparisons = [
+        (item_ids[0], item_ids[1]),
+        (item_ids[0], item_ids[2]),
+        (item_ids[0], item_ids[3]),
+        (item_ids[1], item_ids[2]),
+        (item_ids[1], item_ids[3]),
+        (item_ids[2], item_ids[3]),
+    ]
+    
+    for item1_id, item2_id in comparisons:
         client.post(f'/api/collections/{sample_collection}/matchup',
-            json={'item1_id': item_ids[1], 'item2_id': item_ids[0], 'winner': 'item2'},
+            json={'item1_id': item1_id, 'item2_id': item2_id, 'winner': 'item1'},
             content_type='application/json'
         )
-        
-        # Verify the result is stored correctly
-        comparison = Comparison.query.filter_by(
-            collection_id=sample_collection,
-            item1_id=item_ids[0],  # Should be stored with smaller ID first
-            item2_id=item_ids[1]
-        ).first()
-        assert comparison is not None
-        assert comparison.result == 'item1'  # Winner should be adjusted
+    
+    # Try to get another matchup
+    response = client.get(f'/api/collections/{sample_collection}/matchup')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert 'message' in data
+    assert 'completed' in data['message'].lower()
 
-def test_all_comparisons_completed(client, sample_collection):
-    """Test that matchup endpoint indicates when all comparisons are done."""
-    with client.application.app_context():
-        items = Item.query.filter_by(collection_id=sample_collection).all()
-        item_ids = [item.id for item in items]
-        
-        # Complete all possible comparisons (4 items = 6 comparisons)
-        comparisons = [
-            (item_ids[0], item_ids[1]),
-            (item_ids[0], item_ids[2]),
-            (item_ids[0], item_ids[3]),
-            (item_ids[1], item_ids[2]),
-            (item_ids[1], item_ids[3]),
-            (item_ids[2], item_ids[3]),
-        ]
-        
-        for item1_id, item2_id in comparisons:
-            client.post(f'/api/collections/{sample_collection}/matchup',
-                json={'item1_id': item1_id, 'item2_id': item2_id, 'winner': 'item1'},
-                content_type='application/json'
-            )
-        
-        # Try to get another matchup
-        response = client.get(f'/api/collections/{sample_collection}/matchup')
-        assert response.status_code == 200
-        data = response.get_json()
-        assert 'message' in data
-        assert 'completed' in data['message'].lower()
 
+def test_matchup_suggestion_reused_until_vote(client, sample_collection):
+    """Test that repeated matchup requests reuse the suggestion until a vote is submitted."""
+    first = client.get(f'/api/collections/{sample_collection}/matchup').get_json()
+    second = client.get(f'/api/collections/{sample_collection}/matchup').get_json()
+    assert first == second
+    
+    # Voting on the suggested pair must produce a different suggestion
+    client.post(f'/api/collections/{sample_collection}/matchup',
+        json={'item1_id': first['item1']['id'], 'item2_id': first['item2']['id'], 'winner': 'item1'},
+        content_type='application/json'
+    )
+    
+    third = client.get(f'/api/collections/{sample_collection}/matchup').get_json()
+    assert {third['item1']['id'], third['item2']['id']} != {first['item1']['id'], first['item2']['id']}
+
+def test_submit_matchup_rejects_items_from_other_collection(client, sample_collection):
+    """Test that a vote is rejected when an item doesn't belong to the collection."""
+    response = client.post('/api/collections',
+        json={'name': 'Other Collection', 'items': 'Elsewhere'},
+        content_type='application/json'
+    )
+    other_collection_id = response.get_json()['id']
+    
+    item_id = Item.query.filter_by(collection_id=sample_collection).first().id
+    other_item_id = Item.query.filter_by(collection_id=other_collection_id).first().id
+
+    response = client.post(f'/api/collections/{sample_collection}/matchup',
+        json={'item1_id': item_id, 'item2_id': other_item_id, 'winner': 'item1'},
+        content_type='application/json'
+    )
+    assert response.status_code == 404
+    
+    assert Comparison.query.count() == 0
+    assert db.session.get(Item, item_id).points == 0
+
+def test_submit_matchup_rejects_invalid_winner(client, sample_collection):
+    """Test that a vote with an unknown winner value is rejected."""
+    item_ids = [item.id for item in Item.query.filter_by(collection_id=sample_collection).order_by(Item.id)]
+
+    response = client.post(f'/api/collections/{sample_collection}/matchup',
+        json={'item1_id': item_ids[0], 'item2_id': item_ids[1], 'winner': 'both'},
+        content_type='application/json'
+    )
+    assert response.status_code == 400
+
+def test_submit_matchup_rejects_self_comparison(client, sample_collection, item_ids):
+    """Test that voting an item against itself is rejected and records nothing."""
+    response = client.post(f'/api/collections/{sample_collection}/matchup',
+        json={'item1_id': item_ids[0], 'item2_id': item_ids[0], 'winner': 'item1'},
+        content_type='application/json'
+    )
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'An item cannot be compared with itself'
+    assert Comparison.query.filter_by(collection_id=sample_collection).count() == 0
+
+def test_submit_matchup_over_unknown_stored_result(client, sample_collection, item_ids):
+    """Test that re-voting a pair whose stored result is unrecognised counts it as 0 points."""
+    # Older imports saved result strings verbatim
+    db.session.add(Comparison(collection_id=sample_collection, item1_id=item_ids[0],
+                              item2_id=item_ids[1], result='draw'))
+    db.session.commit()
+    
+    response = client.post(f'/api/collections/{sample_collection}/matchup',
+        json={'item1_id': item_ids[0], 'item2_id': item_ids[1], 'winner': 'item1'},
+        content_type='application/json'
+    )
+    assert response.status_code == 200
+    
+    assert db.session.get(Item, item_ids[0]).points == 1
+    assert db.session.get(Item, item_ids[1]).points == -1
+    comparison = Comparison.query.filter_by(collection_id=sample_collection).one()
+    assert comparison.result == 'item1'
+
+def test_matchup_not_cached_when_write_races_computation(client, sample_collection, monkeypatch):
+    """Test that a suggestion computed while a write lands is served but not cached."""
+    import app as app_module
+    from app import Collection
+    
+    real_get_smart_matchup = app_module.get_smart_matchup
+    def get_smart_matchup_with_concurrent_vote(collection):
+        pair = real_get_smart_matchup(collection)
+        # A vote committed by another request while the pair was being computed
+        app_module.invalidate_matchup_cache(collection.id)
+        return pair
+    monkeypatch.setattr(app_module, 'get_smart_matchup', get_smart_matchup_with_concurrent_vote)
+    
+    collection = db.session.get(Collection, sample_collection)
+    assert app_module.get_cached_smart_matchup(collection) is not None
+    assert sample_collection not in app_module._matchup_cache
@@ -168,3 +168,15 @@ def test_rankings_are_sorted_by_points(client, sample_collection):
         # item_ids[1] beat 2 items but lost to item_ids[0]: 2 wins, 1 loss = 1 point
         assert items_data[1]['points'] == 1
 
+
+def test_pick_best_pair_prefers_least_compared_items():
+    """Test the pair-selection kernel on plain IDs and comparison counts."""
+    from app import pick_best_pair
+    
+    # Item 1 has been compared twice (once with item 2); items 3 and 4 never
+    group_ids = [1, 2, 3, 4]
+    group_counts = [2, 1, 0, 0]
+    compared = {(1, 2)}
+    
+    assert pick_best_pair(group_ids, group_counts, compared) == (3, 4)
+    assert pick_best_pair([1, 2], [1, 1], compared) is None
@@ -172,3 +172,35 @@ def test_tie_breaking_with_multiple_tied_items(client, sample_collection):
         d_index = next(i for i, item in enumerate(items_data) if item['id'] == item_ids[3])
         
         assert b_index < d_index
+
+
+def test_sub_scores_match_with_pair_index(client, sample_collection):
+    """Test that indexed pair lookup gives the same sub-scores as scanning all comparisons."""
+    from app import calculate_sub_scores, index_comparisons_by_pair
+    
+    with client.application.app_context():
+        items = Item.query.filter_by(collection_id=sample_collection).order_by(Item.id).all()
+        item_ids = [item.id for item in items]
+        
+        # A beats B, C beats A, B and C tie, D beats C
+        for item1_id, item2_id, winner in [
+            (item_ids[0], item_ids[1], 'item1'),
+            (item_ids[0], item_ids[2], 'item2'),
+            (item_ids[1], item_ids[2], 'tie'),
+            (item_ids[2], item_ids[3], 'item2'),
+        ]:
+            client.post(f'/api/collections/{sample_collection}/matchup',
+                json={'item1_id': item1_id, 'item2_id': item2_id, 'winner': winner},
+                content_type='application/json'
+            )
+        
+        comparisons = Comparison.query.filter_by(collection_id=sample_collection).all()
+        comparisons_by_pair = index_comparisons_by_pair(comparisons)
+        
+        # Three items have 3 pairs, fewer than the 4 comparisons, so the index is used
+        group = items[:3]
+        assert calculate_sub_scores(group, comparisons, comparisons_by_pair) == \
+            calculate_sub_scores(group, comparisons)
+        assert calculate_sub_scores(group, comparisons, comparisons_by_pair) == {
+            item_ids[0]: 0, item_ids[1]: -1, item_ids[2]: 1
+        }